@@ -9,6 +9,7 @@ __all__ = [
     "Experiment",
     "Backend",
     "CirqBackend",
+    "PureState",
     "Runner",
     "ResultStore",
     "RunRecord",
@@ -29,6 +30,9 @@ def __getattr__(name: str):
     elif name == "CirqBackend":
         from qex.backend import CirqBackend
         return CirqBackend
+    elif name == "PureState":
+        from qex.backend import PureState
+        return PureState
     elif name == "Runner":
         from qex.runner import Runner
         return Runner
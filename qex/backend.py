@@ -3,32 +3,132 @@ Backend abstraction: interface for executing quantum circuits.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
-import cirq
+from typing import TYPE_CHECKING, Dict, Any, Optional, Sequence, Union
 import numpy as np
 
+if TYPE_CHECKING:
+    import cirq
+
+
+class PureState:
+    """
+    A pure state |ψ⟩ whose density matrix |ψ⟩⟨ψ| is only built on request.
+
+    Forming the full 2**n x 2**n density matrix costs O(4**n) time and memory,
+    while most consumers only need a single-qubit reduction that can be
+    computed directly from the state vector in O(2**n).
+
+    Attributes:
+        state_vector: State vector of shape (2**n,) (complex dtype).
+    """
+
+    def __init__(self, state_vector: np.ndarray):
+        """
+        Wrap a state vector.
+
+        Args:
+            state_vector: 1-D state vector of length 2**n (Cirq qubit ordering).
+        """
+        self.state_vector = np.asarray(state_vector)
+
+    def to_density_matrix(self) -> np.ndarray:
+        """
+        Materialize the full density matrix |ψ⟩⟨ψ|.
+
+        Returns:
+            Density matrix of shape (2**n, 2**n) (complex dtype).
+        """
+        sv = self.state_vector
+        return np.outer(sv, np.conj(sv))
+
 
 class Backend(ABC):
     """
     Abstract interface for executing quantum circuits.
 
-    A backend executes a circuit and returns the final density matrix.
+    A backend executes a circuit and returns the final state, either as a
+    density matrix or as a PureState for backends that simulate state vectors.
     Supports circuits with any number of qubits.
     """
 
     @abstractmethod
-    def run(self, circuit: cirq.Circuit) -> np.ndarray:
+    def run(self, circuit: "cirq.Circuit") -> Union[np.ndarray, PureState]:
         """
-        Execute a circuit and return the final density matrix.
+        Execute a circuit and return the final state.
 
         Args:
             circuit: A Cirq Circuit (any number of qubits).
 
         Returns:
-            Density matrix of shape (2**n, 2**n) for n qubits (complex dtype).
+            Density matrix of shape (2**n, 2**n) for n qubits (complex dtype),
+            or a PureState wrapping a state vector of shape (2**n,).
         """
         pass
 
+    def run_many(
+        self,
+        circuits: Sequence["cirq.Circuit"],
+        qubit_order: Sequence["cirq.Qid"],
+    ) -> np.ndarray:
+        """
+        Execute a batch of circuits over a common set of qubits and stack the results.
+
+        The default implementation calls run() once per circuit, first padding it
+        with identities on the qubits of qubit_order it doesn't act on, so every
+        state covers all of qubit_order in Cirq's sorted order. Backends that can
+        amortize setup across a batch should override it.
+
+        Args:
+            circuits: Cirq Circuits to execute.
+            qubit_order: Sorted qubits every state is simulated over; must contain
+                all qubits of every circuit.
+
+        Returns:
+            Array of shape (B, 2**n) holding state vectors when run() returns
+            PureStates, otherwise (B, 2**n, 2**n) holding density matrices,
+            n being len(qubit_order).
+        """
+        import cirq
+
+        states = []
+        for circuit in circuits:
+            idle = [q for q in qubit_order if q not in circuit.all_qubits()]
+            if idle:
+                circuit = circuit + cirq.Circuit(cirq.I.on_each(*idle))
+            states.append(self.run(circuit))
+        return np.stack([
+            state.state_vector if isinstance(state, PureState) else state
+            for state in states
+        ])
+
+    def run_sweep(
+        self,
+        circuit: "cirq.Circuit",
+        params_list: Sequence[Dict[str, Any]],
+    ) -> np.ndarray:
+        """
+        Execute one parametric circuit for each parameter set and stack the results.
+
+        The default implementation resolves the circuit once per parameter set and
+        calls run_many(). Backends with native sweep support should override it.
+
+        Args:
+            circuit: A Cirq Circuit with sympy symbols for its parameters.
+            params_list: Parameter dictionaries mapping symbol names to values.
+
+        Returns:
+            Stacked final states, as returned by run_many().
+        """
+        import cirq
+
+        return self.run_many(
+            [
+                cirq.resolve_parameters(circuit, cirq.ParamResolver(params))
+                for params in params_list
+            ],
+            sorted(circuit.all_qubits()),
+        )
+
     @abstractmethod
     def get_name(self) -> str:
         """
@@ -45,30 +145,110 @@ class CirqBackend(Backend):
     Concrete backend using Cirq's ideal simulator.
 
     Uses Cirq's Simulator for ideal (noiseless) simulation.
-    Results are returned as density matrices derived from statevectors.
+    Results are returned as PureState wrappers around the final statevector;
+    the density matrix is only formed when explicitly requested.
     """
 
-    def __init__(self):
+    _DTYPES = {"single": np.complex64, "double": np.complex128}
+
+    def __init__(self, precision: str = "single"):
         """
         Initialize the Cirq ideal simulator backend.
+
+        Args:
+            precision: "single" (complex64, Cirq's default) or "double" (complex128).
+                Single precision halves the memory traffic of state vectors and
+                everything derived from them.
         """
-        self._simulator = cirq.Simulator()
+        if precision not in self._DTYPES:
+            raise ValueError(f"precision must be 'single' or 'double', got {precision!r}")
+        self.precision = precision
+        # Built on first run so constructing a backend doesn't import cirq
+        self._simulator: Optional["cirq.Simulator"] = None
+
+    def _get_simulator(self) -> "cirq.Simulator":
+        """Return the Cirq simulator, creating it on first use."""
+        if self._simulator is None:
+            import cirq
 
-    def run(self, circuit: cirq.Circuit) -> np.ndarray:
+            self._simulator = cirq.Simulator(dtype=self._DTYPES[self.precision])
+        return self._simulator
+
+    def run(self, circuit: "cirq.Circuit") -> PureState:
         """
-        Execute circuit on ideal Cirq simulator and return density matrix.
+        Execute circuit on ideal Cirq simulator and return the final pure state.
 
         Args:
             circuit: A Cirq Circuit (any number of qubits).
 
         Returns:
-            Density matrix (2**n x 2**n for n qubits, complex dtype).
+            PureState wrapping the final statevector (2**n entries for n qubits,
+            same qubit order as Cirq, big-endian by default).
+        """
+        result = self._get_simulator().simulate(circuit)
+        return PureState(result.final_state_vector)
+
+    def run_many(
+        self,
+        circuits: Sequence["cirq.Circuit"],
+        qubit_order: Sequence["cirq.Qid"],
+    ) -> np.ndarray:
+        """
+        Execute a batch of circuits on one simulator and return their state vectors.
+
+        Args:
+            circuits: Cirq Circuits to execute.
+            qubit_order: Sorted qubits every state is simulated over; must contain
+                all qubits of every circuit.
+
+        Returns:
+            Array of shape (B, 2**n) of final state vectors, n being len(qubit_order).
+        """
+        simulator = self._get_simulator()
+        out = None
+        for i, circuit in enumerate(circuits):
+            sv = simulator.simulate(circuit, qubit_order=qubit_order).final_state_vector
+            if out is None:
+                out = np.empty((len(circuits), sv.shape[0]), dtype=sv.dtype)
+            out[i] = sv
+        if out is None:
+            return np.empty((0, 2 ** len(qubit_order)), dtype=self._DTYPES[self.precision])
+        return out
+
+    def run_sweep(
+        self,
+        circuit: "cirq.Circuit",
+        params_list: Sequence[Dict[str, Any]],
+    ) -> np.ndarray:
+        """
+        Execute one parametric circuit for each parameter set via simulate_sweep.
+
+        The circuit is built once and resolved by the simulator per point,
+        rather than being rebuilt for every parameter set.
+
+        Args:
+            circuit: A Cirq Circuit with sympy symbols for its parameters.
+            params_list: Parameter dictionaries mapping symbol names to values.
+
+        Returns:
+            Array of shape (B, 2**n) of final state vectors.
         """
-        result = self._simulator.simulate(circuit)
-        statevector = result.final_state_vector
-        # |ψ⟩⟨ψ| in same qubit order as Cirq (big-endian by default)
-        rho = np.outer(statevector, np.conj(statevector))
-        return rho
+        import cirq
+
+        results = self._get_simulator().simulate_sweep(
+            circuit,
+            params=[cirq.ParamResolver(params) for params in params_list],
+            qubit_order=sorted(circuit.all_qubits()),
+        )
+        out = None
+        for i, result in enumerate(results):
+            sv = result.final_state_vector
+            if out is None:
+                out = np.empty((len(params_list), sv.shape[0]), dtype=sv.dtype)
+            out[i] = sv
+        if out is None:
+            return np.empty((0, 1), dtype=self._DTYPES[self.precision])
+        return out
 
     def get_name(self) -> str:
         """
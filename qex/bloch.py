@@ -2,42 +2,187 @@
 Bloch sphere visualization: density matrix → (x,y,z) coordinates → HTML artifact.
 """
 
-from typing import Tuple
+from typing import Any, Callable, Dict, Tuple
+import functools
 import numpy as np
 
 
+def _num_qubits(dim: int) -> int:
+    """Return n such that dim == 2**n (n >= 1), or 0 if dim is not such a power of two."""
+    if dim < 2 or dim & (dim - 1):
+        return 0
+    return dim.bit_length() - 1
+
+
 def reduced_density_matrix(rho: np.ndarray, qubit_index: int = 0) -> np.ndarray:
     """
     Partial trace: keep one qubit, trace out the rest.
 
     Assumes Cirq qubit ordering: qubit 0 is most significant in the state vector.
 
+    A 1-D state vector |ψ⟩ is also accepted, in which case the reduction is
+    computed directly from ψ without forming |ψ⟩⟨ψ| (O(2**n) instead of O(4**n)).
+
     Args:
-        rho: Full density matrix, shape (2**n, 2**n).
+        rho: Full density matrix, shape (2**n, 2**n), or state vector, shape (2**n,).
         qubit_index: Which qubit to keep (0 = first qubit). Must be in [0, n-1].
 
     Returns:
         2x2 reduced density matrix for the specified qubit.
     """
-    n = int(round(np.log2(rho.shape[0])))
-    if n < 1 or 2**n != rho.shape[0]:
+    if rho.ndim == 1:
+        return _reduced_density_matrix_from_sv(rho, qubit_index)
+
+    n = _num_qubits(rho.shape[0])
+    if n < 1:
         raise ValueError(f"rho must be 2**n x 2**n, got {rho.shape}")
     if not 0 <= qubit_index < n:
         raise ValueError(f"qubit_index must be in [0, {n-1}], got {qubit_index}")
 
+    # Keep the input precision (complex64 stays complex64); promote real input
+    dtype = np.result_type(rho.dtype, np.complex64)
     if n == 1:
-        return np.asarray(rho, dtype=complex)
+        return np.asarray(rho, dtype=dtype)
+
+    r00, r01, r11 = _ptrace_fn(n, qubit_index)(rho)
+    return np.array([[r00, r01], [np.conj(r01), r11]], dtype=dtype)
+
+
+# Specialized partial-trace functions, generated on first use per (n, qubit_index)
+_ptrace_cache: Dict[Tuple[int, int], Callable[[np.ndarray], tuple]] = {}
+
+# Up to this size the generated trace is fully unrolled into scalar sums
+_UNROLL_MAX_QUBITS = 4
+
+
+def _ptrace_fn(n: int, qubit_index: int) -> Callable[[np.ndarray], tuple]:
+    """
+    Return a function rho -> (ρ00, ρ01, ρ11) specialized for (n, qubit_index).
+
+    ρ is Hermitian, so only the upper triangle of the reduced matrix is traced.
+    For small n the source is generated as straight-line sums over literal
+    (row, col) indices; otherwise it views ρ as (left, i_keep, right, left',
+    j_keep, right'), left/right being the qubits before/after the kept one,
+    with literal reshape dimensions, and traces each block with one einsum
+    over plain strides (no transposed copy of ρ). Either way the source is
+    compiled once and cached.
+    """
+    fn = _ptrace_cache.get((n, qubit_index))
+    if fn is not None:
+        return fn
+
+    name = f"_ptrace_{n}_{qubit_index}"
+    shift = n - 1 - qubit_index
+    if n <= _UNROLL_MAX_QUBITS:
+        def index(bit: int, r: int) -> int:
+            # Insert the kept qubit's bit into the traced index r
+            return ((r >> shift) << (shift + 1)) | (bit << shift) | (r & ((1 << shift) - 1))
+
+        def term(a: int, b: int) -> str:
+            return " + ".join(
+                f"rho[{index(a, r)}, {index(b, r)}]" for r in range(2 ** (n - 1))
+            )
+
+        body = f"    return ({term(0, 0)}, {term(0, 1)}, {term(1, 1)})\n"
+    else:
+        left, right = 2 ** qubit_index, 2 ** shift
+        body = (
+            f"    blocks = rho.reshape({left}, 2, {right}, {left}, 2, {right})\n"
+            f"    return (\n"
+            f"        einsum('ijij->', blocks[:, 0, :, :, 0, :]),\n"
+            f"        einsum('ijij->', blocks[:, 0, :, :, 1, :]),\n"
+            f"        einsum('ijij->', blocks[:, 1, :, :, 1, :]),\n"
+            f"    )\n"
+        )
+    namespace: Dict[str, Any] = {"einsum": np.einsum}
+    exec(compile(f"def {name}(rho):\n{body}", f"<qex.bloch {name}>", "exec"), namespace)
+    fn = namespace[name]
+    _ptrace_cache[(n, qubit_index)] = fn
+    return fn
+
+
+def _reduced_density_matrix_from_sv(sv: np.ndarray, qubit_index: int) -> np.ndarray:
+    """
+    Partial trace of |ψ⟩⟨ψ| computed straight from the state vector ψ.
+    """
+    r00, r01, r11 = _ptrace1_terms(sv, qubit_index)
+    return np.array(
+        [[r00, r01], [np.conj(r01), r11]],
+        dtype=np.result_type(sv.dtype, np.complex64),
+    )
+
+
+# Below this size the NumPy path beats the numba kernel's import/dispatch cost
+_NUMBA_MIN_QUBITS = 10
+
+
+def _ptrace1_terms(sv: np.ndarray, qubit_index: int) -> Tuple[float, complex, float]:
+    """
+    Independent entries (ρ00, ρ01, ρ11) of one qubit's reduced density matrix,
+    taken from the state vector ψ; ρ10 = conj(ρ01) by Hermiticity.
+
+    Moves the kept qubit's axis to the front and views ψ as a 2 x 2**(n-1)
+    matrix with rows A0, A1, so that ρ_ab = ⟨A_b|A_a⟩. For large states the
+    parallel numba kernel is used instead when numba is installed.
+    """
+    n = _num_qubits(sv.shape[0])
+    if n < 1:
+        raise ValueError(f"state vector must have length 2**n, got {sv.shape}")
+    if not 0 <= qubit_index < n:
+        raise ValueError(f"qubit_index must be in [0, {n-1}], got {qubit_index}")
+
+    if n >= _NUMBA_MIN_QUBITS:
+        kernel = _numba_ptrace1()
+        if kernel is not None:
+            return kernel(sv, qubit_index, n)
+
+    psi = np.moveaxis(sv.reshape((2,) * n), qubit_index, 0).reshape(2, 2 ** (n - 1))
+    a0, a1 = psi[0], psi[1]
+    return np.vdot(a0, a0).real, np.vdot(a1, a0), np.vdot(a1, a1).real
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_ptrace1():
+    """
+    Return the numba state-vector partial-trace kernel, or None if numba is
+    not installed. Imported lazily so numba only loads for large states.
+    """
+    try:
+        from qex._ptrace_numba import ptrace1_from_sv
+    except ImportError:
+        return None
+    return ptrace1_from_sv
+
 
-    # Reshape to (2,2,...,2) with 2n axes: (i0,i1,...,j0,j1,...)
-    rho_tensor = rho.reshape((2,) * (2 * n))
-    # Permute so kept qubit is first: (i_keep, i_rest..., j_keep, j_rest...)
-    perm_row = [qubit_index] + [i for i in range(n) if i != qubit_index]
-    perm_col = [n + qubit_index] + [n + i for i in range(n) if i != qubit_index]
-    rho_reorder = np.transpose(rho_tensor, perm_row + perm_col)
-    dim_other = 2 ** (n - 1)
-    rho_reshape = rho_reorder.reshape(2, dim_other, 2, dim_other)
-    rho_red = np.trace(rho_reshape, axis1=1, axis2=3)
-    return rho_red
+def reduced_density_matrix_batch(states: np.ndarray, qubit_index: int = 0) -> np.ndarray:
+    """
+    Batched partial trace: keep one qubit of each state in a stack.
+
+    Args:
+        states: Stack of B state vectors, shape (B, 2**n), or of B density
+            matrices, shape (B, 2**n, 2**n).
+        qubit_index: Which qubit to keep (0 = first qubit). Must be in [0, n-1].
+
+    Returns:
+        Stack of 2x2 reduced density matrices, shape (B, 2, 2).
+    """
+    if states.ndim not in (2, 3):
+        raise ValueError(f"states must have shape (B, 2**n) or (B, 2**n, 2**n), got {states.shape}")
+    batch, dim = states.shape[0], states.shape[1]
+    n = _num_qubits(dim)
+    if n < 1 or (states.ndim == 3 and states.shape[2] != dim):
+        raise ValueError(f"states must have shape (B, 2**n) or (B, 2**n, 2**n), got {states.shape}")
+    if not 0 <= qubit_index < n:
+        raise ValueError(f"qubit_index must be in [0, {n-1}], got {qubit_index}")
+
+    # Same (left, keep, right) view as reduced_density_matrix, per state
+    left, right = 2 ** qubit_index, 2 ** (n - 1 - qubit_index)
+    if states.ndim == 2:
+        psi = states.reshape(batch, left, 2, right)
+        return np.einsum("ziaj,zibj->zab", psi, psi.conj())
+    return np.einsum(
+        "ziajibj->zab", states.reshape(batch, left, 2, right, left, 2, right)
+    )
 
 
 def density_matrix_to_bloch(rho: np.ndarray) -> Tuple[float, float, float]:
@@ -49,7 +194,8 @@ def density_matrix_to_bloch(rho: np.ndarray) -> Tuple[float, float, float]:
         y = Tr(ρ · σ_y)
         z = Tr(ρ · σ_z)
 
-    where σ_x, σ_y, σ_z are the Pauli matrices.
+    where σ_x, σ_y, σ_z are the Pauli matrices. For ρ = [[a, b], [c, d]] these
+    reduce to x = 2·Re(b), y = -2·Im(b), z = Re(a - d), which is what is evaluated.
 
     For multi-qubit rho (2**n x 2**n), use reduced_density_matrix first to get
     a 2x2 matrix for one qubit, then pass that here.
@@ -64,49 +210,67 @@ def density_matrix_to_bloch(rho: np.ndarray) -> Tuple[float, float, float]:
     """
     if rho.shape != (2, 2):
         raise ValueError(f"density_matrix_to_bloch expects 2x2 matrix, got {rho.shape}")
-    # Pauli matrices
-    sigma_x = np.array([[0, 1], [1, 0]], dtype=complex)
-    sigma_y = np.array([[0, -1j], [1j, 0]], dtype=complex)
-    sigma_z = np.array([[1, 0], [0, -1]], dtype=complex)
-    
-    # Compute Bloch coordinates: Tr(ρ · σ_i)
-    x = np.real(np.trace(rho @ sigma_x))
-    y = np.real(np.trace(rho @ sigma_y))
-    z = np.real(np.trace(rho @ sigma_z))
-    
+    b = rho[0, 1]
+    x = 2.0 * b.real
+    y = -2.0 * b.imag
+    z = (rho[0, 0] - rho[1, 1]).real
+
     return (float(x), float(y), float(z))
 
 
-def bloch_to_html(x: float, y: float, z: float, title: str = "Bloch Sphere") -> str:
+def bloch_from_sv(sv: np.ndarray, qubit_index: int = 0) -> Tuple[float, float, float]:
     """
-    Generate an HTML artifact visualizing a point on the Bloch sphere.
-    
-    The HTML should:
-    - Render a 3D Bloch sphere
-    - Mark the point (x, y, z) on the sphere
-    - Display the coordinates
-    - Be self-contained (no external dependencies, or use CDN for 3D library)
-    - Be viewable in a browser
-    
+    Bloch sphere coordinates (x, y, z) of one qubit of a pure state |ψ⟩.
+
+    Equivalent to density_matrix_to_bloch(reduced_density_matrix(sv, qubit_index))
+    but only the three independent entries ρ00, ρ01, ρ11 of the reduced density
+    matrix are accumulated; no 2x2 (or larger) matrix is materialized.
+
     Args:
-        x: X coordinate on Bloch sphere.
-        y: Y coordinate on Bloch sphere.
-        z: Z coordinate on Bloch sphere.
-        title: Optional title for the visualization.
-    
+        sv: State vector, shape (2**n,).
+        qubit_index: Which qubit to keep (0 = first qubit). Must be in [0, n-1].
+
     Returns:
-        Complete HTML string that can be saved to a file and opened in a browser.
+        Tuple of (x, y, z) coordinates as real floats.
     """
-    # Use Three.js via CDN for 3D visualization
-    html = f"""<!DOCTYPE html>
+    r00, r01, r11 = _ptrace1_terms(sv, qubit_index)
+    return (float(2.0 * r01.real), float(-2.0 * r01.imag), float(r00 - r11))
+
+
+def density_matrix_to_bloch_batch(rhos: np.ndarray) -> np.ndarray:
+    """
+    Convert a stack of 1-qubit density matrices to Bloch coordinates.
+
+    Vectorized form of density_matrix_to_bloch for parameter sweeps.
+
+    Args:
+        rhos: Stack of 2x2 density matrices, shape (B, 2, 2).
+
+    Returns:
+        Array of (x, y, z) coordinates, shape (B, 3), real dtype.
+    """
+    if rhos.ndim != 3 or rhos.shape[1:] != (2, 2):
+        raise ValueError(f"density_matrix_to_bloch_batch expects (B, 2, 2) array, got {rhos.shape}")
+    b = rhos[:, 0, 1]
+    return np.stack(
+        [2.0 * b.real, -2.0 * b.imag, (rhos[:, 0, 0] - rhos[:, 1, 1]).real],
+        axis=-1,
+    )
+
+
+# Static parts of the Bloch sphere HTML, built once at import; only the title
+# and coordinates are interpolated per call in bloch_to_html.
+_HTML_PREFIX = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>"""
+
+_HTML_MIDDLE = """</title>
     <script src="https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js"></script>
     <style>
-        body {{
+        body {
             margin: 0;
             font-family: Arial, sans-serif;
             background: #1a1a1a;
@@ -115,38 +279,32 @@ def bloch_to_html(x: float, y: float, z: float, title: str = "Bloch Sphere") ->
             flex-direction: column;
             align-items: center;
             padding: 20px;
-        }}
-        #container {{
+        }
+        #container {
             width: 800px;
             height: 600px;
             border: 2px solid #444;
             border-radius: 8px;
             margin: 20px 0;
-        }}
-        #info {{
+        }
+        #info {
             text-align: center;
             margin: 10px 0;
-        }}
-        .coord {{
+        }
+        .coord {
             display: inline-block;
             margin: 0 15px;
             font-family: monospace;
-        }}
+        }
     </style>
 </head>
 <body>
-    <h1>{title}</h1>
-    <div id="container"></div>
-    <div id="info">
-        <div class="coord">x = {x:.4f}</div>
-        <div class="coord">y = {y:.4f}</div>
-        <div class="coord">z = {z:.4f}</div>
-    </div>
-    <script>
-        // Scene setup
+    <h1>"""
+
+_HTML_SCENE = """        // Scene setup
         const scene = new THREE.Scene();
         const camera = new THREE.PerspectiveCamera(75, 800/600, 0.1, 1000);
-        const renderer = new THREE.WebGLRenderer({{ antialias: true }});
+        const renderer = new THREE.WebGLRenderer({ antialias: true });
         renderer.setSize(800, 600);
         document.getElementById('container').appendChild(renderer.domElement);
         
@@ -159,19 +317,19 @@ def bloch_to_html(x: float, y: float, z: float, title: str = "Bloch Sphere") ->
         
         // Bloch sphere (unit sphere)
         const sphereGeometry = new THREE.SphereGeometry(1, 32, 32);
-        const sphereMaterial = new THREE.MeshPhongMaterial({{
+        const sphereMaterial = new THREE.MeshPhongMaterial({
             color: 0x4a90e2,
             transparent: true,
             opacity: 0.3,
             side: THREE.DoubleSide,
             wireframe: false
-        }});
+        });
         const sphere = new THREE.Mesh(sphereGeometry, sphereMaterial);
         scene.add(sphere);
         
         // Wireframe overlay
         const wireframe = new THREE.WireframeGeometry(sphereGeometry);
-        const wireframeLine = new THREE.LineSegments(wireframe, new THREE.LineBasicMaterial({{ color: 0xffffff, opacity: 0.2 }}));
+        const wireframeLine = new THREE.LineSegments(wireframe, new THREE.LineBasicMaterial({ color: 0xffffff, opacity: 0.2 }));
         scene.add(wireframeLine);
         
         // Axes
@@ -180,17 +338,12 @@ def bloch_to_html(x: float, y: float, z: float, title: str = "Bloch Sphere") ->
         
         // Point marker
         const pointGeometry = new THREE.SphereGeometry(0.05, 16, 16);
-        const pointMaterial = new THREE.MeshPhongMaterial({{ color: 0xff4444 }});
+        const pointMaterial = new THREE.MeshPhongMaterial({ color: 0xff4444 });
         const point = new THREE.Mesh(pointGeometry, pointMaterial);
-        point.position.set({x}, {y}, {z});
-        scene.add(point);
-        
-        // Line from origin to point
-        const lineGeometry = new THREE.BufferGeometry().setFromPoints([
-            new THREE.Vector3(0, 0, 0),
-            new THREE.Vector3({x}, {y}, {z})
-        ]);
-        const lineMaterial = new THREE.LineBasicMaterial({{ color: 0xff4444, linewidth: 2 }});
+        point.position.set("""
+
+_HTML_SUFFIX = """        ]);
+        const lineMaterial = new THREE.LineBasicMaterial({ color: 0xff4444, linewidth: 2 });
         const line = new THREE.Line(lineGeometry, lineMaterial);
         scene.add(line);
         
@@ -200,16 +353,60 @@ def bloch_to_html(x: float, y: float, z: float, title: str = "Bloch Sphere") ->
         
         // Animation loop
         let angle = 0;
-        function animate() {{
+        function animate() {
             requestAnimationFrame(animate);
             angle += 0.01;
             camera.position.x = 2.5 * Math.cos(angle);
             camera.position.z = 2.5 * Math.sin(angle);
             camera.lookAt(0, 0, 0);
             renderer.render(scene, camera);
-        }}
+        }
         animate();
     </script>
 </body>
 </html>"""
-    return html
+
+
+def bloch_to_html(x: float, y: float, z: float, title: str = "Bloch Sphere") -> str:
+    """
+    Generate an HTML artifact visualizing a point on the Bloch sphere.
+    
+    The HTML should:
+    - Render a 3D Bloch sphere
+    - Mark the point (x, y, z) on the sphere
+    - Display the coordinates
+    - Be self-contained (no external dependencies, or use CDN for 3D library)
+    - Be viewable in a browser
+    
+    Args:
+        x: X coordinate on Bloch sphere.
+        y: Y coordinate on Bloch sphere.
+        z: Z coordinate on Bloch sphere.
+        title: Optional title for the visualization.
+    
+    Returns:
+        Complete HTML string that can be saved to a file and opened in a browser.
+    """
+    # Use Three.js via CDN for 3D visualization
+    return (
+        _HTML_PREFIX + title + _HTML_MIDDLE
+        + f"""{title}</h1>
+    <div id="container"></div>
+    <div id="info">
+        <div class="coord">x = {x:.4f}</div>
+        <div class="coord">y = {y:.4f}</div>
+        <div class="coord">z = {z:.4f}</div>
+    </div>
+    <script>
+"""
+        + _HTML_SCENE
+        + f"""{x}, {y}, {z});
+        scene.add(point);
+        
+        // Line from origin to point
+        const lineGeometry = new THREE.BufferGeometry().setFromPoints([
+            new THREE.Vector3(0, 0, 0),
+            new THREE.Vector3({x}, {y}, {z})
+"""
+        + _HTML_SUFFIX
+    )
@@ -2,10 +2,12 @@
 Built-in demo experiments for validation.
 """
 
-from typing import Dict, Any, Sequence
-import cirq
+from typing import TYPE_CHECKING, Dict, Any, Sequence, Tuple
 from qex.experiment import Experiment
 
+if TYPE_CHECKING:
+    import cirq
+
 
 def x_gate_experiment() -> Experiment:
     """
@@ -16,7 +18,9 @@ def x_gate_experiment() -> Experiment:
     Returns:
         Experiment with no parameters.
     """
-    def builder(qubits: Sequence[cirq.Qid], params: Dict[str, Any]) -> cirq.Circuit:
+    def builder(qubits: Sequence["cirq.Qid"], params: Dict[str, Any]) -> "cirq.Circuit":
+        import cirq
+
         return cirq.Circuit(cirq.X(qubits[0]))
 
     return Experiment(name="x_gate", builder=builder)
@@ -31,7 +35,9 @@ def hadamard_experiment() -> Experiment:
     Returns:
         Experiment with no parameters.
     """
-    def builder(qubits: Sequence[cirq.Qid], params: Dict[str, Any]) -> cirq.Circuit:
+    def builder(qubits: Sequence["cirq.Qid"], params: Dict[str, Any]) -> "cirq.Circuit":
+        import cirq
+
         return cirq.Circuit(cirq.H(qubits[0]))
 
     return Experiment(name="hadamard", builder=builder)
@@ -42,18 +48,35 @@ def ry_sweep_experiment() -> Experiment:
     Demo: |0⟩ → Ry(θ) sweep
 
     Rotation around Y-axis with parameter θ (on first qubit).
-    Expects params = {"theta": float} in radians.
+    Expects params = {"theta": float} in radians. Also provides a parametric
+    form with a sympy "theta" symbol, so sweeps reuse a single circuit.
 
     Returns:
         Experiment that takes "theta" parameter.
     """
-    def builder(qubits: Sequence[cirq.Qid], params: Dict[str, Any]) -> cirq.Circuit:
+    def validate(params: Dict[str, Any]) -> None:
         theta = params.get("theta", 0.0)
         if not isinstance(theta, (int, float)):
             raise ValueError(f"theta must be a number, got {type(theta)}")
-        return cirq.Circuit(cirq.ry(theta)(qubits[0]))
 
-    return Experiment(name="ry_sweep", builder=builder)
+    def builder(qubits: Sequence["cirq.Qid"], params: Dict[str, Any]) -> "cirq.Circuit":
+        import cirq
+
+        validate(params)
+        return cirq.Circuit(cirq.ry(params.get("theta", 0.0))(qubits[0]))
+
+    def parametric_builder(qubits: Sequence["cirq.Qid"]) -> Tuple["cirq.Circuit", Tuple[str]]:
+        import cirq
+        import sympy  # type: ignore[import-untyped]
+
+        return cirq.Circuit(cirq.ry(sympy.Symbol("theta"))(qubits[0])), ("theta",)
+
+    return Experiment(
+        name="ry_sweep",
+        builder=builder,
+        parametric_builder=parametric_builder,
+        param_validator=validate,
+    )
 
 
 def bell_state_experiment() -> Experiment:
@@ -65,7 +88,9 @@ def bell_state_experiment() -> Experiment:
     Returns:
         Experiment with no parameters (uses 2 qubits).
     """
-    def builder(qubits: Sequence[cirq.Qid], params: Dict[str, Any]) -> cirq.Circuit:
+    def builder(qubits: Sequence["cirq.Qid"], params: Dict[str, Any]) -> "cirq.Circuit":
+        import cirq
+
         if len(qubits) < 2:
             raise ValueError("Bell state experiment requires at least 2 qubits")
         return cirq.Circuit(
@@ -2,8 +2,10 @@
 Experiment abstraction: parametric circuit builder.
 """
 
-from typing import Callable, Dict, Any, Sequence, Union
-import cirq
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    import cirq
 
 
 class Experiment:
@@ -13,15 +15,27 @@ class Experiment:
     An experiment has a name and a function that builds a Cirq circuit
     from a set of qubits and parameters. Circuits may use 1 or more qubits.
 
+    An experiment may also provide a parametric builder returning one circuit
+    with sympy symbols in place of parameter values, which sweeps can resolve
+    per point instead of rebuilding the circuit. Since that skips the builder,
+    the checks it applies to params should be given as a param validator too.
+
     Attributes:
         name: Unique identifier for the experiment.
         builder: Function (qubits, params) -> Cirq Circuit.
+        parametric_builder: Optional function qubits -> (Cirq Circuit, parameter names).
+        param_validator: Optional function params -> None raising ValueError
+            for parameters the builder would reject.
     """
 
     def __init__(
         self,
         name: str,
-        builder: Callable[[Sequence[cirq.Qid], Dict[str, Any]], cirq.Circuit],
+        builder: Callable[[Sequence["cirq.Qid"], Dict[str, Any]], "cirq.Circuit"],
+        parametric_builder: Optional[
+            Callable[[Sequence["cirq.Qid"]], Tuple["cirq.Circuit", Sequence[str]]]
+        ] = None,
+        param_validator: Optional[Callable[[Dict[str, Any]], None]] = None,
     ):
         """
         Initialize an experiment.
@@ -29,15 +43,23 @@ class Experiment:
         Args:
             name: Unique name for the experiment.
             builder: (qubits: Sequence[cirq.Qid], params: Dict[str, Any]) -> cirq.Circuit
+            parametric_builder: Optional (qubits: Sequence[cirq.Qid]) ->
+                (cirq.Circuit, parameter names), the circuit using sympy.Symbol(name)
+                for each parameter.
+            param_validator: Optional (params: Dict[str, Any]) -> None raising
+                ValueError for invalid parameters; run before resolving the
+                parametric circuit.
         """
         self.name = name
         self.builder = builder
+        self.parametric_builder = parametric_builder
+        self.param_validator = param_validator
 
     def build_circuit(
         self,
-        qubits: Union[cirq.Qid, Sequence[cirq.Qid]],
+        qubits: Union["cirq.Qid", Sequence["cirq.Qid"]],
         params: Dict[str, Any],
-    ) -> cirq.Circuit:
+    ) -> "cirq.Circuit":
         """
         Build the circuit for this experiment with given qubits and parameters.
 
@@ -48,8 +70,37 @@ class Experiment:
         Returns:
             A Cirq Circuit operating on the given qubits.
         """
+        if qubits.__class__ is tuple:
+            return self.builder(qubits, params)
+
+        import cirq
+
         if isinstance(qubits, cirq.Qid):
             qubits = (qubits,)
         else:
             qubits = tuple(qubits)
         return self.builder(qubits, params)
+
+    def build_parametric(
+        self,
+        qubits: Union["cirq.Qid", Sequence["cirq.Qid"]],
+    ) -> Tuple["cirq.Circuit", Tuple[str, ...]]:
+        """
+        Build the symbolic circuit for this experiment with given qubits.
+
+        Args:
+            qubits: Single qubit or sequence of qubits to operate on.
+
+        Returns:
+            Tuple of (circuit with unresolved sympy symbols, parameter names).
+        """
+        import cirq
+
+        if self.parametric_builder is None:
+            raise ValueError(f"Experiment {self.name!r} has no parametric builder")
+        if isinstance(qubits, cirq.Qid):
+            qubits = (qubits,)
+        else:
+            qubits = tuple(qubits)
+        circuit, param_names = self.parametric_builder(qubits)
+        return circuit, tuple(param_names)
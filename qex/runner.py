@@ -2,16 +2,33 @@
 Runner: executes experiments with parameters and configuration.
 """
 
+import base64
+import os
 import time
 import uuid
-from typing import Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, AbstractSet, Callable, Dict, Any, List, Optional, Sequence, Set, Tuple, Union
 from pathlib import Path
-import cirq
 import numpy as np
-from qex.experiment import Experiment
-from qex.backend import Backend
+from qex.backend import Backend, PureState
 from qex.store import RunRecord  # type: ignore
-from qex.bloch import density_matrix_to_bloch, bloch_to_html, reduced_density_matrix
+from qex.bloch import (
+    bloch_from_sv,
+    density_matrix_to_bloch,
+    density_matrix_to_bloch_batch,
+    bloch_to_html,
+    reduced_density_matrix,
+    reduced_density_matrix_batch,
+)
+
+if TYPE_CHECKING:
+    import cirq
+    import h5py  # type: ignore[import-untyped]
+    from qex.experiment import Experiment
+
+
+# Bloch point of |0⟩, the state of any qubit a circuit does not act on
+_GROUND_BLOCH = (0.0, 0.0, 1.0)
 
 
 class Runner:
@@ -22,7 +39,16 @@ class Runner:
     and artifact generation. It does not handle persistence (that's ResultStore's job).
     """
 
-    def __init__(self, backend: Backend, base_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        backend: Backend,
+        base_dir: Optional[Path] = None,
+        archive: Optional[str] = None,
+        id_strategy: str = "uuid",
+        emit_artifacts: bool = True,
+        persist_rho: bool = True,
+        async_io: bool = False,
+    ):
         """
         Initialize a runner with a backend.
 
@@ -30,8 +56,40 @@ class Runner:
             backend: The backend to use for circuit execution.
             base_dir: Base directory for storing results and artifacts.
                      If None, defaults to current directory.
+            archive: Optional HDF5 file name (relative to base_dir), e.g. "rho.h5".
+                    When set, states are appended to this single archive instead
+                    of one .npy file per run. Requires h5py.
+            id_strategy: How run IDs are generated. "uuid" (default) draws a
+                    random UUID4 per run; "counter" draws one random session
+                    nonce and numbers runs within it, avoiding a urandom read
+                    per run on large sweeps.
+            emit_artifacts: Runner-wide switch for the Bloch sphere HTML. If False,
+                    it is never generated or written, whatever config["save_bloch_html"]
+                    says; that key only turns the artifact off for single runs of a
+                    runner that emits it. Useful for benchmarks and tests that only
+                    need the Bloch point recorded in each record's metadata["bloch"].
+            persist_rho: If False, run states are not saved and records carry
+                    density_matrix_path=None.
+            async_io: If True, .npy and HTML files are written by a background
+                    thread pool so the next circuit can be simulated meanwhile.
+                    Paths in returned RunRecords may not exist until flush()
+                    (or close()) returns. HDF5 archive writes stay synchronous.
         """
+        if id_strategy not in ("uuid", "counter"):
+            raise ValueError(f"id_strategy must be 'uuid' or 'counter', got {id_strategy!r}")
         self.backend = backend
+        self.archive = archive
+        self.id_strategy = id_strategy
+        self.emit_artifacts = emit_artifacts
+        self.persist_rho = persist_rho
+        self._archive_file: Optional["h5py.File"] = None
+        self._io = ThreadPoolExecutor(max_workers=2) if async_io else None
+        self._pending: Set[Future] = set()
+        self._counter = 0
+        self._session_nonce = (
+            base64.b32encode(os.urandom(10)).decode("ascii").lower()
+            if id_strategy == "counter" else None
+        )
         self.base_dir = Path(base_dir) if base_dir else Path.cwd()
         self.base_dir.mkdir(parents=True, exist_ok=True)
         (self.base_dir / "results").mkdir(exist_ok=True)
@@ -39,7 +97,7 @@ class Runner:
 
     def run(
         self,
-        experiment: Experiment,
+        experiment: "Experiment",
         params: Dict[str, Any],
         config: Optional[Dict[str, Any]] = None,
     ) -> RunRecord:
@@ -50,52 +108,336 @@ class Runner:
             experiment: The experiment to run.
             params: Parameters for the experiment's circuit builder.
             config: Optional configuration. Use "qubits" (list of cirq.Qid) to set
-                   qubits; defaults to [GridQubit(0, 0)].
+                   qubits; defaults to [GridQubit(0, 0)]. Set "save_full_rho" to
+                   True to persist the full density matrix for pure-state backends;
+                   by default only the state vector is saved. Set "save_bloch_html"
+                   to False to skip the Bloch sphere HTML artifact, which shows
+                   the first configured qubit (it is never written when the runner
+                   was created with emit_artifacts=False). "metadata" is a dict
+                   copied into the record's metadata.
 
         Returns:
             RunRecord containing density matrix path, artifacts, and metadata.
+            The metadata keys "qubits" (configured qubit names) and "bloch" (the
+            first configured qubit's Bloch point) are set by the runner and
+            override the same keys in config["metadata"].
         """
         config = config or {}
 
-        run_id = str(uuid.uuid4())
+        run_id = self._new_run_id()
         timestamp = time.time()
 
+        qubits = self._resolve_qubits(config)
+        circuit = experiment.build_circuit(qubits, params)
+
+        # The backend only simulates the qubits the circuit acts on (in Cirq's
+        # sorted order), so locate the visualized qubit within that subset. A
+        # qubit the circuit never touches stays in |0⟩: its Bloch point is
+        # known and, unless the state must be persisted, nothing is simulated.
+        # Otherwise the state is always consumed, if only for the Bloch point
+        # recorded in the run's metadata.
+        used = circuit.all_qubits()
+        target = self._target_index(qubits[0], used)
+        rho_path: Optional[str] = None
+        bloch: Tuple[float, float, float] = _GROUND_BLOCH
+        if self.persist_rho or target is not None:
+            state = self.backend.run(circuit)
+            if self.persist_rho:
+                rho_path = self._save_state(run_id, state, config)
+            if target is not None:
+                if isinstance(state, PureState):
+                    # Reduce straight from |ψ⟩; |ψ⟩⟨ψ| is only built if asked to persist it
+                    bloch = bloch_from_sv(state.state_vector, qubit_index=target)
+                else:
+                    bloch = density_matrix_to_bloch(
+                        reduced_density_matrix(state, qubit_index=target)
+                    )
+
+        artifacts: Dict[str, str] = {}
+        if self.emit_artifacts and config.get("save_bloch_html", True):
+            artifacts = self._write_bloch_artifact(
+                run_id, experiment, bloch, 2 ** len(used)
+            )
+        return self._make_record(
+            run_id, experiment, params, timestamp, rho_path, artifacts,
+            [str(q) for q in qubits], config, bloch,
+        )
+
+    def run_sweep(
+        self,
+        experiment: "Experiment",
+        params_list: Sequence[Dict[str, Any]],
+        config: Optional[Dict[str, Any]] = None,
+    ) -> List[RunRecord]:
+        """
+        Execute an experiment once per parameter set and return one record per run.
+
+        Equivalent to calling run() for each entry of params_list with the same
+        config, but circuits are executed as one batch via Backend.run_many and
+        the single-qubit reductions and Bloch coordinates of the whole sweep are
+        computed in one vectorized pass. All records share one timestamp.
+
+        If the experiment has a parametric builder and every parameter set
+        supplies each of its parameters, its symbolic circuit is built once and
+        resolved per point via Backend.run_sweep, after checking every parameter
+        set with the experiment's param_validator. Otherwise each point is built
+        (and validated) by the regular builder.
+
+        Args:
+            experiment: The experiment to run.
+            params_list: Parameter dictionaries, one per sweep point.
+            config: Optional configuration shared by all runs (see run()).
+
+        Returns:
+            List of RunRecords, in the same order as params_list.
+        """
+        config = config or {}
+        if not params_list:
+            return []
+
+        qubits = self._resolve_qubits(config)
+        sweep = None
+        if experiment.parametric_builder is not None:
+            # One symbolic circuit resolved per point instead of N rebuilt circuits
+            circuit, param_names = experiment.build_parametric(qubits)
+            # Points missing a parameter are left to the regular builder's defaults
+            if all(name in params for params in params_list for name in param_names):
+                if experiment.param_validator is not None:
+                    for params in params_list:
+                        experiment.param_validator(params)
+                sweep = (circuit, [
+                    {name: params[name] for name in param_names} for params in params_list
+                ])
+        if sweep is not None:
+            used = sweep[0].all_qubits()
+        else:
+            circuits = [experiment.build_circuit(qubits, params) for params in params_list]
+            used = frozenset().union(*(circuit.all_qubits() for circuit in circuits))
+
+        # As in run(): simulate only when the visualized qubit is touched or
+        # the states must be persisted
+        target = self._target_index(qubits[0], used)
+        run_ids = [self._new_run_id() for _ in params_list]
+        rho_paths: List[Optional[str]] = [None] * len(params_list)
+        bloch: List[Tuple[float, float, float]] = [_GROUND_BLOCH] * len(params_list)
+        if self.persist_rho or target is not None:
+            if sweep is not None:
+                stacked = self.backend.run_sweep(*sweep)
+            else:
+                stacked = self.backend.run_many(circuits, sorted(used))
+            if self.persist_rho:
+                # Rows of a state-vector stack are pure states like run()'s
+                rho_paths = [
+                    self._save_state(
+                        run_id, PureState(row) if stacked.ndim == 2 else row, config
+                    )
+                    for run_id, row in zip(run_ids, stacked)
+                ]
+            if target is not None:
+                bloch = [
+                    (x, y, z) for x, y, z in density_matrix_to_bloch_batch(
+                        reduced_density_matrix_batch(stacked, qubit_index=target)
+                    ).tolist()
+                ]
+
+        save_bloch_html = self.emit_artifacts and config.get("save_bloch_html", True)
+
+        timestamp = time.time()
+        qubit_names = [str(q) for q in qubits]
+        records = []
+        for run_id, params, rho_path, point in zip(run_ids, params_list, rho_paths, bloch):
+            artifacts: Dict[str, str] = {}
+            if save_bloch_html:
+                artifacts = self._write_bloch_artifact(
+                    run_id, experiment, point, 2 ** len(used)
+                )
+            records.append(self._make_record(
+                run_id, experiment, params, timestamp, rho_path, artifacts,
+                qubit_names, config, point,
+            ))
+        return records
+
+    @staticmethod
+    def _target_index(qubit: "cirq.Qid", used: AbstractSet["cirq.Qid"]) -> Optional[int]:
+        """
+        Index of `qubit` in the simulated state (the sorted qubits a circuit acts
+        on), or None if the circuit never touches it.
+        """
+        if qubit not in used:
+            return None
+        return sorted(used).index(qubit)
+
+    def _new_run_id(self) -> str:
+        """Generate the next run ID according to id_strategy."""
+        if self._session_nonce is None:
+            return str(uuid.uuid4())
+        self._counter += 1
+        return f"{self._counter:08x}-{self._session_nonce}"
+
+    def _resolve_qubits(self, config: Dict[str, Any]) -> Tuple["cirq.Qid", ...]:
+        """Normalize config["qubits"] to a tuple, defaulting to (GridQubit(0, 0),)."""
+        import cirq
+
         qubits = config.get("qubits")
         if qubits is None:
-            qubits = [cirq.GridQubit(0, 0)]
-        elif isinstance(qubits, cirq.Qid):
-            qubits = [qubits]
+            return (cirq.GridQubit(0, 0),)
+        if isinstance(qubits, cirq.Qid):
+            return (qubits,)
+        return tuple(qubits)
+
+    def _save_state(
+        self,
+        run_id: str,
+        state: Union[np.ndarray, PureState],
+        config: Dict[str, Any],
+    ) -> str:
+        """
+        Persist a run's final state and return its path relative to base_dir.
+
+        A PureState is saved as its state vector unless config["save_full_rho"]
+        is set, in which case |ψ⟩⟨ψ| is formed and saved instead. With an archive
+        the returned path has the form "<archive>:/<dataset>/<index>".
+        """
+        if not isinstance(state, PureState):
+            kind, data = "rho", state
+        elif config.get("save_full_rho", False):
+            kind, data = "rho", state.to_density_matrix()
         else:
-            qubits = list(qubits)
+            kind, data = "psi", state.state_vector
 
-        circuit = experiment.build_circuit(qubits, params)
-        rho = self.backend.run(circuit)
+        if self.archive is not None:
+            return self._append_to_archive(self.archive, kind, data)
+        rho_path = f"results/{run_id}_{kind}.npy"
+        self._write(np.save, self.base_dir / rho_path, data)
+        return rho_path
+
+    def _append_to_archive(self, archive: str, kind: str, data: np.ndarray) -> str:
+        """
+        Append one state to the HDF5 archive, opening it on first use.
+
+        States are grouped into one resizable dataset per kind and dimension
+        (e.g. "psi/4" for 2-qubit state vectors), chunked one state per chunk.
+        """
+        if self._archive_file is None:
+            try:
+                import h5py  # type: ignore[import-untyped]
+            except ImportError as e:
+                raise ImportError(
+                    "h5py is required for Runner(archive=...); "
+                    "install it with `pip install qex[archive]`"
+                ) from e
+            self._archive_file = h5py.File(self.base_dir / archive, "a", libver="latest")
+
+        name = f"{kind}/{data.shape[0]}"
+        ds = self._archive_file.get(name)
+        if ds is None:
+            ds = self._archive_file.create_dataset(
+                name,
+                shape=(0,) + data.shape,
+                maxshape=(None,) + data.shape,
+                chunks=(1,) + data.shape,
+                dtype=data.dtype,
+            )
+        index = ds.shape[0]
+        ds.resize(index + 1, axis=0)
+        ds[index] = data.astype(ds.dtype, copy=False)
+        return f"{archive}:/{name}/{index}"
+
+    def _write(self, write_fn: Callable[..., Any], *args: Any) -> None:
+        """Run a file write now, or queue it on the I/O pool when async_io is on."""
+        if self._io is None:
+            write_fn(*args)
+            return
+        future = self._io.submit(write_fn, *args)
+        self._pending.add(future)
+        future.add_done_callback(self._forget_if_ok)
 
-        rho_path = f"results/{run_id}_rho.npy"
-        np.save(self.base_dir / rho_path, rho)
+    def _forget_if_ok(self, future: Future) -> None:
+        """Drop a finished write, keeping failed ones for flush() to report."""
+        if future.exception() is None:
+            self._pending.discard(future)
 
+    def flush(self) -> None:
+        """
+        Wait for all queued background writes to finish.
+
+        Raises:
+            The first exception raised by a failed background write, if any.
+        """
+        pending = list(self._pending)
+        wait(pending)
+        self._pending.clear()
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """
+        Flush pending writes, stop the I/O pool and close the HDF5 archive.
+
+        Call this once the runner is done so other processes can read the archive.
+        """
+        try:
+            self.flush()
+        finally:
+            if self._io is not None:
+                self._io.shutdown(wait=True)
+                self._io = None
+            if self._archive_file is not None:
+                self._archive_file.close()
+                self._archive_file = None
+
+    def _write_bloch_artifact(
+        self,
+        run_id: str,
+        experiment: "Experiment",
+        coords: Tuple[float, float, float],
+        dim: int,
+    ) -> Dict[str, str]:
+        """Write the Bloch sphere HTML for qubit 0 and return the artifacts dict."""
+        x, y, z = coords
         artifacts: Dict[str, str] = {}
-        if rho.shape == (2, 2):
-            x, y, z = density_matrix_to_bloch(rho)
+        if dim == 2:
             html_content = bloch_to_html(
                 x, y, z, title=f"{experiment.name} - {run_id[:8]}"
             )
             html_path = f"artifacts/{run_id}_bloch.html"
-            (self.base_dir / html_path).write_text(html_content)
+            self._write(Path.write_text, self.base_dir / html_path, html_content)
             artifacts["bloch_sphere"] = html_path
         else:
-            rho_red = reduced_density_matrix(rho, qubit_index=0)
-            x, y, z = density_matrix_to_bloch(rho_red)
             html_content = bloch_to_html(
                 x, y, z,
                 title=f"{experiment.name} (qubit 0) - {run_id[:8]}",
             )
             html_path = f"artifacts/{run_id}_bloch_qubit0.html"
-            (self.base_dir / html_path).write_text(html_content)
+            self._write(Path.write_text, self.base_dir / html_path, html_content)
             artifacts["bloch_sphere_qubit0"] = html_path
+        return artifacts
+
+    def _make_record(
+        self,
+        run_id: str,
+        experiment: "Experiment",
+        params: Dict[str, Any],
+        timestamp: float,
+        rho_path: Optional[str],
+        artifacts: Dict[str, str],
+        qubit_names: List[str],
+        config: Dict[str, Any],
+        bloch: Tuple[float, float, float],
+    ) -> RunRecord:
+        """
+        Assemble the RunRecord for a finished run.
 
-        metadata = dict(config.get("metadata", {}))
-        metadata["qubits"] = [str(q) for q in qubits]
+        The Bloch point of the first configured qubit is recorded as
+        metadata["bloch"], so runs can be validated without any files. The
+        runner's "qubits" and "bloch" keys take precedence over config["metadata"].
+        """
+        cfg_meta = config.get("metadata")
+        result_meta = {"qubits": qubit_names, "bloch": [float(c) for c in bloch]}
+        if cfg_meta:
+            metadata = {**cfg_meta, **result_meta}
+        else:
+            metadata = result_meta
 
         record = RunRecord(
             run_id=run_id,
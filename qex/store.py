@@ -8,6 +8,7 @@ import json
 import sqlite3
 import numpy as np
 import uuid
+from qex.backend import PureState
 
 
 class RunRecord:
@@ -20,7 +21,7 @@ class RunRecord:
     - Parameters dictionary (JSON-serializable)
     - Backend name
     - Timestamp
-    - Path to density matrix file (numpy .npy)
+    - Path to density matrix or state vector file (numpy .npy), if persisted
     - Path to artifacts (e.g., Bloch sphere HTML)
     - Additional metadata
     """
@@ -32,7 +33,7 @@ class RunRecord:
         params: Dict[str, Any],
         backend_name: str,
         timestamp: float,
-        density_matrix_path: str,
+        density_matrix_path: Optional[str],
         artifacts: Dict[str, str],  # artifact_name -> file_path
         metadata: Optional[Dict[str, Any]] = None
     ):
@@ -45,7 +46,9 @@ class RunRecord:
             params: Parameters used for this run.
             backend_name: Name of the backend used.
             timestamp: Unix timestamp of when run was executed.
-            density_matrix_path: Path to saved density matrix (.npy file).
+            density_matrix_path: Path to saved density matrix or state vector (.npy file,
+                or "<archive>:/<dataset>/<index>" inside an HDF5 archive), or None
+                if the state was not persisted.
             artifacts: Dictionary mapping artifact names to file paths.
             metadata: Optional additional metadata.
         """
@@ -67,13 +70,53 @@ class RunRecord:
         """
         Load and return the density matrix for this run.
 
+        Runs that persisted only the state vector |ψ⟩ are expanded to |ψ⟩⟨ψ|.
+
         Returns:
             Density matrix (2x2 for 1 qubit, 2**n x 2**n for n qubits, complex dtype).
         """
+        if self.density_matrix_path is None:
+            raise ValueError(f"Run {self.run_id} did not persist its density matrix.")
         if self._base_dir is None:
             raise ValueError("Base directory not set. Use ResultStore.get_run() to load records.")
-        full_path = self._base_dir / self.density_matrix_path
-        return np.load(full_path)
+        data = _load_array(self._base_dir, self.density_matrix_path)
+        if data.ndim == 1:
+            return PureState(data).to_density_matrix()
+        return data
+
+
+def _load_array(base_dir: Path, path: str) -> np.ndarray:
+    """
+    Load an array saved by the Runner, either a .npy file or an HDF5 archive
+    entry of the form "<archive>:/<dataset>/<index>".
+    """
+    if ":/" not in path:
+        return np.load(base_dir / path)
+    try:
+        import h5py  # type: ignore[import-untyped]
+    except ImportError as e:
+        raise ImportError(
+            "h5py is required to load runs stored in an HDF5 archive; "
+            "install it with `pip install qex[archive]`"
+        ) from e
+
+    archive, _, key = path.partition(":/")
+    dataset, _, index = key.rpartition("/")
+    with h5py.File(base_dir / archive, "r") as f:
+        return f[dataset][int(index)]
+
+
+# Columns of the runs table; density_matrix_path is NULL for runs whose state
+# was not persisted
+_RUNS_COLUMNS = """
+    run_id TEXT PRIMARY KEY,
+    experiment_name TEXT NOT NULL,
+    params TEXT NOT NULL,
+    backend_name TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    density_matrix_path TEXT,
+    metadata TEXT
+"""
 
 
 class ResultStore:
@@ -104,17 +147,8 @@ class ResultStore:
         cursor = self.conn.cursor()
         
         # Create runs table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS runs (
-                run_id TEXT PRIMARY KEY,
-                experiment_name TEXT NOT NULL,
-                params TEXT NOT NULL,
-                backend_name TEXT NOT NULL,
-                timestamp REAL NOT NULL,
-                density_matrix_path TEXT NOT NULL,
-                metadata TEXT
-            )
-        """)
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS runs ({_RUNS_COLUMNS})")
+        self._migrate_nullable_density_matrix_path(cursor)
         
         # Create artifacts table
         cursor.execute("""
@@ -144,6 +178,26 @@ class ResultStore:
         
         self.conn.commit()
     
+    def _migrate_nullable_density_matrix_path(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Drop the NOT NULL constraint on runs.density_matrix_path in databases
+        created before runs could skip persisting their state.
+
+        SQLite cannot alter a column constraint, so the table is rebuilt and
+        its rows copied over. Indexes are recreated by _initialize_schema.
+        """
+        cursor.execute("PRAGMA table_info(runs)")
+        columns = {row["name"]: row for row in cursor.fetchall()}
+        if not columns["density_matrix_path"]["notnull"]:
+            return
+
+        names = ", ".join(columns)
+        cursor.execute("DROP TABLE IF EXISTS runs_migrated")  # left by an interrupted migration
+        cursor.execute(f"CREATE TABLE runs_migrated ({_RUNS_COLUMNS})")
+        cursor.execute(f"INSERT INTO runs_migrated ({names}) SELECT {names} FROM runs")
+        cursor.execute("DROP TABLE runs")
+        cursor.execute("ALTER TABLE runs_migrated RENAME TO runs")
+    
     def _ensure_directories(self) -> None:
         """Create results and artifacts directories if they don't exist."""
         (self.base_dir / "results").mkdir(parents=True, exist_ok=True)
@@ -11,14 +11,18 @@ import numpy as np
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from qex import CirqBackend, Runner, ResultStore
+from qex import Backend, CirqBackend, Experiment, PureState, Runner, ResultStore
 from qex.demos import (
     x_gate_experiment,
     hadamard_experiment,
     ry_sweep_experiment,
     bell_state_experiment,
 )
-from qex.bloch import density_matrix_to_bloch, reduced_density_matrix
+from qex.bloch import (
+    bloch_from_sv,
+    density_matrix_to_bloch,
+    reduced_density_matrix,
+)
 
 
 def test_x_gate():
@@ -31,7 +35,7 @@ def test_x_gate():
     runner = Runner(backend, base_dir=base_dir)
     experiment = x_gate_experiment()
     
-    record = runner.run(experiment, params={})
+    record = runner.run(experiment, params={}, config={"save_full_rho": True})
     
     # Load and check density matrix using the record's path
     rho = np.load(base_dir / record.density_matrix_path)
@@ -70,7 +74,7 @@ def test_hadamard():
     runner = Runner(backend, base_dir=base_dir)
     experiment = hadamard_experiment()
     
-    record = runner.run(experiment, params={})
+    record = runner.run(experiment, params={}, config={"save_full_rho": True})
     
     # Load density matrix using the record's path
     rho = np.load(base_dir / record.density_matrix_path)
@@ -112,7 +116,9 @@ def test_ry_sweep():
     # Test with theta = π/2 (should create |+⟩ state)
     # Note: Ry(π/2)|0⟩ = |+⟩, not |+i⟩
     theta = np.pi / 2
-    record = runner.run(experiment, params={"theta": theta})
+    record = runner.run(
+        experiment, params={"theta": theta}, config={"save_full_rho": True}
+    )
     
     # Load density matrix using the record's path
     rho = np.load(base_dir / record.density_matrix_path)
@@ -218,7 +224,7 @@ def test_bell_state():
     record = runner.run(
         experiment,
         params={},
-        config={"qubits": qubits},
+        config={"qubits": qubits, "save_full_rho": True},
     )
 
     rho = np.load(base_dir / record.density_matrix_path)
@@ -253,6 +259,472 @@ def test_bell_state():
     return True
 
 
+def test_state_vector_persistence():
+    """Test default runs persist |ψ⟩ and reduce without forming |ψ⟩⟨ψ|"""
+    print("Test 6: State Vector Persistence")
+    print("-" * 50)
+
+    base_dir = Path("qex_data")
+    qubits = [cirq.GridQubit(0, 0), cirq.GridQubit(0, 1)]
+    backend = CirqBackend()
+    runner = Runner(backend, base_dir=base_dir)
+    experiment = bell_state_experiment()
+
+    record = runner.run(experiment, params={}, config={"qubits": qubits})
+
+    sv = np.load(base_dir / record.density_matrix_path)
+    if sv.shape != (4,):
+        print(f"✗ Expected state vector of length 4, got {sv.shape}")
+        return False
+    print("✓ State vector persisted instead of full density matrix")
+
+    record.set_base_dir(base_dir)
+    rho = record.get_density_matrix()
+    if not np.allclose(rho, np.outer(sv, np.conj(sv))):
+        print("✗ get_density_matrix did not expand |ψ⟩ to |ψ⟩⟨ψ|")
+        return False
+    print("✓ get_density_matrix expands |ψ⟩ to |ψ⟩⟨ψ|")
+
+    for k in range(2):
+        if not np.allclose(reduced_density_matrix(sv, k), reduced_density_matrix(rho, k)):
+            print(f"✗ Reduced density matrix from |ψ⟩ differs for qubit {k}")
+            return False
+    print("✓ Reduced density matrices from |ψ⟩ match those from ρ")
+
+    for k in range(2):
+        expected = density_matrix_to_bloch(reduced_density_matrix(rho, k))
+        if not np.allclose(bloch_from_sv(sv, k), expected, atol=1e-6):
+            print(f"✗ bloch_from_sv differs for qubit {k}")
+            return False
+    print("✓ bloch_from_sv matches the reduced density matrix path")
+
+    print()
+    return True
+
+
+def test_run_sweep():
+    """Test batched Ry sweep matches |0⟩ → Ry(θ) for every point"""
+    print("Test 7: Batched Ry Sweep")
+    print("-" * 50)
+
+    base_dir = Path("qex_data")
+    backend = CirqBackend()
+    runner = Runner(backend, base_dir=base_dir)
+    experiment = ry_sweep_experiment()
+
+    thetas = np.linspace(0, np.pi, 5)
+    records = runner.run_sweep(experiment, [{"theta": float(t)} for t in thetas])
+    if len(records) != len(thetas):
+        print(f"✗ Expected {len(thetas)} records, got {len(records)}")
+        return False
+    print(f"✓ {len(records)} records returned")
+
+    for theta, record in zip(thetas, records):
+        record.set_base_dir(base_dir)
+        rho = reduced_density_matrix(record.get_density_matrix(), 0)
+        x, y, z = density_matrix_to_bloch(rho)
+        if not np.allclose((x, y, z), (np.sin(theta), 0.0, np.cos(theta)), atol=1e-5):
+            print(f"✗ θ = {theta:.4f}: Bloch ({x:.4f}, {y:.4f}, {z:.4f}) incorrect")
+            return False
+        if not (base_dir / record.artifacts["bloch_sphere"]).exists():
+            print(f"✗ θ = {theta:.4f}: Bloch artifact missing")
+            return False
+    print("✓ All sweep points on the XZ great circle at angle θ")
+
+    # The parametric fast path must reject what the regular builder rejects
+    try:
+        runner.run_sweep(experiment, [{"theta": np.float32(0.2)}])
+    except ValueError:
+        print("✓ Non-float θ rejected as in run()")
+    else:
+        print("✗ run_sweep accepted a θ that run() rejects")
+        return False
+
+    print()
+    return True
+
+
+def test_no_io_mode():
+    """Test runs without artifacts or persisted states"""
+    print("Test 8: No-I/O Mode")
+    print("-" * 50)
+
+    base_dir = Path("qex_data_noio")
+    db_path = base_dir / "qex.db"
+    if db_path.exists():
+        db_path.unlink()
+
+    backend = CirqBackend()
+    runner = Runner(backend, base_dir=base_dir, emit_artifacts=False, persist_rho=False)
+    store = ResultStore(db_path)
+
+    record = runner.run(hadamard_experiment(), params={})
+    records = runner.run_sweep(ry_sweep_experiment(), [{"theta": 0.0}, {"theta": np.pi}])
+    written = list((base_dir / "results").iterdir()) + list((base_dir / "artifacts").iterdir())
+    if written:
+        print(f"✗ Expected no files to be written, found {len(written)}")
+        return False
+    print("✓ No state or artifact files written")
+
+    for r in [record] + records:
+        if r.density_matrix_path is not None or r.artifacts:
+            print("✗ Records should have no density matrix path or artifacts")
+            return False
+        store.save_run(r)
+    retrieved = store.get_run(record.run_id)
+    if retrieved is None or retrieved.density_matrix_path is not None:
+        print("✗ Record without density matrix path did not round-trip")
+        return False
+    print("✓ Records without density matrix path persist and load")
+
+    # H|0⟩ = |+⟩ and Ry(0)|0⟩, Ry(π)|0⟩ sit on the +X axis and the two poles
+    expected = [(1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (0.0, 0.0, -1.0)]
+    for r, bloch in zip([retrieved] + records, expected):
+        if not np.allclose(r.metadata["bloch"], bloch, atol=1e-5):
+            print(f"✗ Recorded Bloch point {r.metadata['bloch']} != {bloch}")
+            return False
+    print("✓ Bloch coordinates recorded in run metadata")
+
+    store.close()
+    print()
+    return True
+
+
+def test_async_io():
+    """Test background writes land on disk after flush()"""
+    print("Test 9: Async I/O")
+    print("-" * 50)
+
+    base_dir = Path("qex_data")
+    backend = CirqBackend()
+    runner = Runner(backend, base_dir=base_dir, async_io=True)
+    experiment = ry_sweep_experiment()
+
+    records = [runner.run(experiment, {"theta": float(t)}) for t in np.linspace(0, np.pi, 4)]
+    runner.flush()
+    for record in records:
+        paths = [record.density_matrix_path] + list(record.artifacts.values())
+        if not all((base_dir / path).exists() for path in paths):
+            print(f"✗ Files for run {record.run_id[:8]} missing after flush()")
+            return False
+    print("✓ All state and artifact files written after flush()")
+
+    runner.close()
+    print()
+    return True
+
+
+def test_untouched_qubits():
+    """Test the visualized qubit is found within the simulated subset"""
+    print("Test 10: Untouched Qubits")
+    print("-" * 50)
+
+    base_dir = Path("qex_data")
+    backend = CirqBackend()
+    runner = Runner(backend, base_dir=base_dir)
+
+    # qubits[0] sorts after qubits[1], so it is not first in the simulated state
+    qubits = [cirq.GridQubit(0, 1), cirq.GridQubit(0, 0)]
+    flip_first = Experiment(
+        "flip_first",
+        lambda qs, params: cirq.Circuit(cirq.X(qs[0]), cirq.H(qs[1])),
+    )
+    record = runner.run(flip_first, params={}, config={"qubits": qubits})
+    html = (base_dir / record.artifacts["bloch_sphere_qubit0"]).read_text()
+    if "z = -1.0000" not in html:
+        print("✗ Bloch point should be the south pole of qubits[0]")
+        return False
+    print("✓ Bloch point taken from qubits[0] in the simulated order")
+
+    # qubits[0] is never touched: it stays at |0⟩ and needs no simulation
+    runner = Runner(backend, base_dir=base_dir, persist_rho=False)
+    flip_second = Experiment(
+        "flip_second",
+        lambda qs, params: cirq.Circuit(cirq.X(qs[1])),
+    )
+    for record in [runner.run(flip_second, params={}, config={"qubits": qubits})] + \
+            runner.run_sweep(flip_second, [{}, {}], config={"qubits": qubits}):
+        html = (base_dir / list(record.artifacts.values())[0]).read_text()
+        if "z = 1.0000" not in html:
+            print("✗ Untouched qubits[0] should be at the north pole")
+            return False
+    print("✓ Untouched qubits[0] reported at |0⟩")
+
+    print()
+    return True
+
+
+def test_precision():
+    """Test double precision yields complex128 states and reductions"""
+    print("Test 11: Backend Precision")
+    print("-" * 50)
+
+    try:
+        CirqBackend(precision="half")
+    except ValueError:
+        print("✓ Invalid precision rejected")
+    else:
+        print("✗ Invalid precision should raise ValueError")
+        return False
+
+    qubits = [cirq.GridQubit(0, 0), cirq.GridQubit(0, 1)]
+    circuit = bell_state_experiment().build_circuit(qubits, {})
+    for precision, dtype in [("single", np.complex64), ("double", np.complex128)]:
+        backend = CirqBackend(precision=precision)
+        sv = backend.run(circuit).state_vector
+        batch = backend.run_many([circuit, circuit], qubits)
+        if sv.dtype != dtype or batch.dtype != dtype or backend.run_many([], qubits).dtype != dtype:
+            print(f"✗ {precision}: expected {np.dtype(dtype)} states")
+            return False
+        if reduced_density_matrix(sv, 0).dtype != dtype:
+            print(f"✗ {precision}: expected {np.dtype(dtype)} reduced density matrix")
+            return False
+    print("✓ States and reductions use the configured precision")
+
+    print()
+    return True
+
+
+def test_archive():
+    """Test runs stored in an HDF5 archive round-trip through ResultStore"""
+    print("Test 12: HDF5 Archive")
+    print("-" * 50)
+
+    try:
+        import h5py  # noqa: F401
+    except ImportError:
+        print("- h5py not installed, skipping")
+        print()
+        return True
+
+    base_dir = Path("qex_data_archive")
+    for path in [base_dir / "qex.db", base_dir / "states.h5"]:
+        if path.exists():
+            path.unlink()
+
+    qubits = [cirq.GridQubit(0, 0), cirq.GridQubit(0, 1)]
+    backend = CirqBackend()
+    runner = Runner(backend, base_dir=base_dir, archive="states.h5")
+    store = ResultStore(base_dir / "qex.db")
+
+    bell = runner.run(bell_state_experiment(), params={}, config={"qubits": qubits})
+    bell_rho = runner.run(
+        bell_state_experiment(), params={},
+        config={"qubits": qubits, "save_full_rho": True},
+    )
+    thetas = [0.0, np.pi / 2, np.pi]
+    sweep = runner.run_sweep(ry_sweep_experiment(), [{"theta": t} for t in thetas])
+    runner.close()
+
+    expected_paths = [
+        "states.h5:/psi/4/0", "states.h5:/rho/4/0",
+        "states.h5:/psi/2/0", "states.h5:/psi/2/1", "states.h5:/psi/2/2",
+    ]
+    records = [bell, bell_rho] + sweep
+    if [r.density_matrix_path for r in records] != expected_paths:
+        print(f"✗ Unexpected archive paths: {[r.density_matrix_path for r in records]}")
+        return False
+    print("✓ States appended to psi/<dim> and rho/<dim> datasets")
+
+    for record in records:
+        store.save_run(record)
+    bell_state = np.zeros((4, 4), dtype=complex)
+    bell_state[0, 0] = bell_state[0, 3] = bell_state[3, 0] = bell_state[3, 3] = 0.5
+    for run_id in [bell.run_id, bell_rho.run_id]:
+        rho = store.get_run(run_id).get_density_matrix()
+        if not np.allclose(rho, bell_state, atol=1e-6):
+            print("✗ Bell state loaded from the archive doesn't match |Φ⁺⟩⟨Φ⁺|")
+            return False
+    for theta, record in zip(thetas, sweep):
+        rho = store.get_run(record.run_id).get_density_matrix()
+        if not np.allclose(density_matrix_to_bloch(rho), (np.sin(theta), 0.0, np.cos(theta)), atol=1e-5):
+            print(f"✗ θ = {theta:.4f}: state loaded from the archive is incorrect")
+            return False
+    print("✓ Archived states load back through ResultStore")
+
+    store.close()
+    print()
+    return True
+
+
+def test_numba_ptrace():
+    """Test the numba state-vector kernel against the NumPy reduction"""
+    print("Test 13: Numba Partial Trace")
+    print("-" * 50)
+
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        print("- numba not installed, skipping")
+        print()
+        return True
+
+    # 10 qubits is the smallest size routed to the numba kernel
+    n = 10
+    rng = np.random.default_rng(7)
+    sv = rng.normal(size=2 ** n) + 1j * rng.normal(size=2 ** n)
+    sv /= np.linalg.norm(sv)
+
+    for k in [0, n // 2, n - 1]:
+        psi = np.moveaxis(sv.reshape((2,) * n), k, 0).reshape(2, -1)
+        expected = psi @ psi.conj().T
+        if not np.allclose(reduced_density_matrix(sv, k), expected):
+            print(f"✗ Reduced density matrix differs for qubit {k}")
+            return False
+        if not np.allclose(bloch_from_sv(sv, k), density_matrix_to_bloch(expected)):
+            print(f"✗ bloch_from_sv differs for qubit {k}")
+            return False
+    print(f"✓ Numba kernel matches NumPy for a random {n}-qubit state")
+
+    print()
+    return True
+
+
+def test_counter_ids():
+    """Test counter run IDs are unique and round-trip through ResultStore"""
+    print("Test 14: Counter Run IDs")
+    print("-" * 50)
+
+    base_dir = Path("qex_data_counter")
+    db_path = base_dir / "qex.db"
+    if db_path.exists():
+        db_path.unlink()
+
+    backend = CirqBackend()
+    try:
+        Runner(backend, base_dir=base_dir, id_strategy="sequential")
+    except ValueError:
+        print("✓ Unknown id_strategy rejected")
+    else:
+        print("✗ Unknown id_strategy should raise ValueError")
+        return False
+
+    runner = Runner(backend, base_dir=base_dir, id_strategy="counter")
+    store = ResultStore(db_path)
+    experiment = ry_sweep_experiment()
+    records = [runner.run(experiment, {"theta": 0.0})]
+    records += runner.run_sweep(experiment, [{"theta": float(t)} for t in np.linspace(0, np.pi, 5)])
+
+    run_ids = [r.run_id for r in records]
+    if len(set(run_ids)) != len(run_ids):
+        print("✗ Counter run IDs are not unique")
+        return False
+    if len({run_id[:8] for run_id in run_ids}) != len(run_ids):
+        print("✗ Counter run ID prefixes (used in artifact titles) collide")
+        return False
+    print("✓ Run IDs and their 8-character prefixes are unique")
+
+    for record in records:
+        store.save_run(record)
+    for record in records:
+        retrieved = store.get_run(record.run_id)
+        if retrieved is None or retrieved.params != record.params:
+            print(f"✗ Run {record.run_id} did not round-trip")
+            return False
+        if retrieved.get_density_matrix().shape != (2, 2):
+            print(f"✗ State of run {record.run_id} did not load")
+            return False
+    print("✓ Counter-ID records persist and load")
+
+    store.close()
+    print()
+    return True
+
+
+def test_schema_migration():
+    """Test a database created before nullable density_matrix_path is migrated"""
+    print("Test 15: Schema Migration")
+    print("-" * 50)
+
+    import sqlite3
+
+    base_dir = Path("qex_data_migration")
+    base_dir.mkdir(exist_ok=True)
+    db_path = base_dir / "qex.db"
+    if db_path.exists():
+        db_path.unlink()
+
+    # Schema and row as written by earlier versions of ResultStore
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("""
+        CREATE TABLE runs (
+            run_id TEXT PRIMARY KEY,
+            experiment_name TEXT NOT NULL,
+            params TEXT NOT NULL,
+            backend_name TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            density_matrix_path TEXT NOT NULL,
+            metadata TEXT
+        )
+    """)
+    conn.execute(
+        "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ("old-run", "x_gate", "{}", "cirq_ideal", 1.0, "results/old-run_rho.npy", None),
+    )
+    conn.commit()
+    conn.close()
+
+    store = ResultStore(db_path)
+    runner = Runner(CirqBackend(), base_dir=base_dir, emit_artifacts=False, persist_rho=False)
+    record = runner.run(x_gate_experiment(), params={})
+    store.save_run(record)
+    print("✓ Record without density matrix path saved to an old database")
+
+    old = store.get_run("old-run")
+    if old is None or old.density_matrix_path != "results/old-run_rho.npy":
+        print("✗ Existing run lost during migration")
+        return False
+    if len(store.list_runs()) != 2:
+        print("✗ Expected both runs after migration")
+        return False
+    print("✓ Existing runs preserved")
+
+    store.close()
+    print()
+    return True
+
+
+def test_default_run_many():
+    """Test sweeps on a backend that only implements run()"""
+    print("Test 16: Default Backend.run_many")
+    print("-" * 50)
+
+    class RunOnlyBackend(Backend):
+        def run(self, circuit):
+            return PureState(cirq.Simulator().simulate(circuit).final_state_vector)
+
+        def get_name(self):
+            return "run_only"
+
+    base_dir = Path("qex_data")
+    runner = Runner(RunOnlyBackend(), base_dir=base_dir, emit_artifacts=False)
+    qubits = [cirq.GridQubit(0, 0), cirq.GridQubit(0, 1)]
+    circuits = {
+        "x": lambda qs: cirq.Circuit(cirq.X(qs[0])),
+        "xh": lambda qs: cirq.Circuit(cirq.X(qs[0]), cirq.H(qs[1])),
+        "h_second": lambda qs: cirq.Circuit(cirq.H(qs[1])),
+    }
+    experiment = Experiment("mixed", lambda qs, params: circuits[params["case"]](qs))
+
+    # Circuits acting on different qubit sets, including one that leaves
+    # qubits[0] idle while having the same size as the first
+    cases = ["x", "xh", "h_second"]
+    records = runner.run_sweep(experiment, [{"case": c} for c in cases], config={"qubits": qubits})
+    for case, record in zip(cases, records):
+        expected = runner.run(experiment, {"case": case}, config={"qubits": qubits})
+        if not np.allclose(record.metadata["bloch"], expected.metadata["bloch"], atol=1e-6):
+            print(f"✗ {case}: sweep Bloch point {record.metadata['bloch']} != run() {expected.metadata['bloch']}")
+            return False
+        record.set_base_dir(base_dir)
+        if record.get_density_matrix().shape != (4, 4):
+            print(f"✗ {case}: state not simulated over both qubits")
+            return False
+    print("✓ Sweep matches run() for circuits on different qubit sets")
+
+    print()
+    return True
+
+
 def main():
     """Run all tests"""
     print("=" * 50)
@@ -266,6 +738,17 @@ def main():
         test_ry_sweep,
         test_persistence,
         test_bell_state,
+        test_state_vector_persistence,
+        test_run_sweep,
+        test_no_io_mode,
+        test_async_io,
+        test_untouched_qubits,
+        test_precision,
+        test_archive,
+        test_numba_ptrace,
+        test_counter_ids,
+        test_schema_migration,
+        test_default_run_many,
     ]
     
     results = []